@@ -1,5 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Final, Callable
+import base64
+import os
 import re
 
 from inspect_ai import Task, eval, task
@@ -8,11 +11,28 @@ from inspect_ai.model import ChatMessage, ChatMessageUser, ContentImage, Content
 from inspect_ai.scorer import CORRECT, INCORRECT, Score, Target, accuracy, scorer, stderr
 from inspect_ai.solver import generate, system_message, TaskState
 
-IMAGE_EXTS: Final[set[str]] = {".png", ".jpg", ".jpeg", ".webp"}
+IMAGE_EXTS: Final[frozenset[str]] = frozenset({".png", ".jpg", ".jpeg", ".webp"})
+# Common-case suffixes for a C-level endswith check, avoiding a lowercase copy per entry
+_IMAGE_SUFFIXES: Final[tuple[str, ...]] = tuple(
+    sorted(IMAGE_EXTS) + sorted(ext.upper() for ext in IMAGE_EXTS)
+)
+IMAGE_MIME_TYPES: Final[dict[str, str]] = {
+    ".png": "image/png",
+    ".jpg": "image/jpeg",
+    ".jpeg": "image/jpeg",
+    ".webp": "image/webp",
+}
+
+_WS_TABLE: Final[dict[int, None]] = str.maketrans("", "", " \t\n\r\f\v\x1c\x1d\x1e\x1f")
+_WS_RE: Final[re.Pattern[str]] = re.compile(r"\s+")
 
 def _normalize(s: str) -> str:
     # Remove whitespace and lowercase
-    return re.sub(r"\s+", "", s).lower()
+    # translate() handles ASCII whitespace fast, regex only needed for unicode whitespace
+    s = s.translate(_WS_TABLE)
+    if not s.isascii():
+        s = _WS_RE.sub("", s)
+    return s.lower()
 
 # Answers are stored lowercased and without spaces
 # But we also want to keep the raw completion
@@ -21,7 +41,11 @@ def custom_scorer() -> Callable:
     async def score(state: TaskState, target: Target) -> Score:
         raw: str = state.output.completion
         answer: str = _normalize(raw)
-        targets: list[str] = [_normalize(t) for t in target]
+        # Targets are normalized once at dataset construction
+        # Fall back for samples without it (e.g. re-scoring older logs)
+        targets: list[str] | None = state.metadata.get("norm_targets")
+        if targets is None:
+            targets = [_normalize(t) for t in target]
 
         return Score(
             value=CORRECT if answer in targets else INCORRECT,
@@ -42,6 +66,22 @@ def label_from_filename(image_path: Path) -> list[str]:
         raise ValueError(f"Bad filename (need at least two '_' delimited parts): {image_path.name}")
     return parts[1:]
 
+def _has_image_suffix(name: str) -> bool:
+    # Must agree with Path.suffix: a bare dotfile like ".png" has no suffix and is skipped
+    if name.endswith(_IMAGE_SUFFIXES):
+        return name not in _IMAGE_SUFFIXES
+    # Mixed-case extensions like .Jpg still need the slow path
+    return Path(name).suffix.lower() in IMAGE_EXTS
+
+def image_to_data_uri(image_path: Path) -> str:
+    """
+    Reads and base64-encodes an image into a data URI
+    Done once per dataset so model runs share the payload instead of each re-encoding the file
+    """
+    mime = IMAGE_MIME_TYPES[image_path.suffix.lower()]
+    encoded = base64.b64encode(image_path.read_bytes()).decode("ascii")
+    return f"data:{mime};base64,{encoded}"
+
 def dataset_from_image_folder(image_dir: Path, prompt: str) -> MemoryDataset:
     """
     Compiles all samples (from images folder) into a MemoryDataset
@@ -51,20 +91,28 @@ def dataset_from_image_folder(image_dir: Path, prompt: str) -> MemoryDataset:
     if not image_dir.is_dir():
         raise NotADirectoryError(image_dir)
 
-    images = sorted(
-        p for p in image_dir.iterdir() if p.is_file() and p.suffix.lower() in IMAGE_EXTS
-    )
+    # scandir's DirEntry.is_file() reuses directory-read info instead of a stat per entry
+    with os.scandir(image_dir) as entries:
+        images = sorted(
+            Path(e.path)
+            for e in entries
+            if e.is_file() and _has_image_suffix(e.name)
+        )
     if not images:
         raise ValueError(f"No images found in {image_dir} (extensions: {sorted(IMAGE_EXTS)})")
 
+    # Disk reads are I/O-bound, so encode images in parallel
+    with ThreadPoolExecutor(max_workers=min(32, len(images))) as ex:
+        data_uris = list(ex.map(image_to_data_uri, images))
+
     samples: list[Sample] = []
-    for image_path in images:
+    for image_path, data_uri in zip(images, data_uris):
         # Labels are stored in filenames to ensure image-label mismatch can never happen
         target = label_from_filename(image_path)
         input_messages: list[ChatMessage] = [
             ChatMessageUser(
                 content=[
-                    ContentImage(image=str(image_path.resolve())),
+                    ContentImage(image=data_uri),
                     ContentText(text=prompt),
                 ],
                 metadata={"filename": image_path.name},
@@ -75,6 +123,11 @@ def dataset_from_image_folder(image_dir: Path, prompt: str) -> MemoryDataset:
                 id=image_path.name,
                 input=input_messages,
                 target=target,
+                metadata={
+                    "filename": image_path.name,
+                    # Stored as a sorted list so it serializes cleanly into eval logs
+                    "norm_targets": sorted({_normalize(t) for t in target}),
+                },
             )
         )
 
@@ -92,6 +145,8 @@ def run_benchmark(
     """
     Runs benchmark on given models with images from images_dir (which must follow naming convention) and prompt
     """
+    if not models:
+        raise ValueError("At least one model is required")
 
     @task
     def create_task(image_dir: str, prompt: str) -> Task:
@@ -104,10 +159,11 @@ def run_benchmark(
             scorer=custom_scorer(),
         )
 
-    result = eval(
+    # One log per model, so every one of them has to succeed
+    results = eval(
         create_task(image_dir=images_dir, prompt=prompt),
         model=models,
         log_dir=log_dir,
-    )[0]
-    
-    return result.status == "success"
\ No newline at end of file
+    )
+
+    return all(result.status == "success" for result in results)
\ No newline at end of file
@@ -1,5 +1,9 @@
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
 from html import escape
+from operator import attrgetter
+import io
 import re
 import os
 from pathlib import Path
@@ -11,17 +15,18 @@ from inspect_ai.scorer import CORRECT, INCORRECT
 # Everything here is just to generate markdown tables from eval logs, not part of actual benchmark functionality,
 # in order to easily visualize benchmark results on github
 
-@dataclass(slots=True)
+# Frozen so the materialized accuracy can never drift from the counts it was computed from
+@dataclass(slots=True, frozen=True)
 class ModelSummary:
     name: str
     num_correct: int
     total_samples: int
+    accuracy: float = field(init=False, compare=False)
 
-    @property
-    def accuracy(self) -> float:
-        if self.total_samples == 0:
-            return 0.0
-        return self.num_correct / self.total_samples
+    # Materialized once instead of recomputed on every access
+    def __post_init__(self) -> None:
+        accuracy = self.num_correct / self.total_samples if self.total_samples else 0.0
+        object.__setattr__(self, "accuracy", accuracy)
 
 
 @dataclass(slots=True)
@@ -29,8 +34,10 @@ class SampleResult:
     filename: str
     completion: str
     correct: bool
-    image_path: Path
     targets: tuple[str, ...] # Unlimited number of targets
+    sort_key: tuple # Natural-order key for filename, computed once per sample
+    filename_html: str # Filename escaped for cell text, with <br> line breaks
+    filename_attr: str # Filename quote-escaped for use inside attributes
 
 # Always load eval logs from files, instead of passing them in as object
 # Keeps table generation disconnected from actual benchmarking
@@ -38,11 +45,16 @@ def get_eval_logs(path: Path) -> list[EvalLog]:
     if not path.is_dir():
         raise FileNotFoundError(f"Log directory not found: {path}")
 
-    eval_files = sorted(f for f in path.iterdir() if f.is_file() and f.suffix == ".eval")
+    with os.scandir(path) as entries:
+        eval_files = sorted(
+            Path(e.path) for e in entries if e.is_file() and os.path.splitext(e.name)[1] == ".eval"
+        )
     if not eval_files:
         raise FileNotFoundError(f"No eval log files found in {path}")
 
-    return [read_eval_log(f) for f in eval_files]
+    # Log parsing is mostly disk-bound, so read logs concurrently (map preserves sorted order)
+    with ThreadPoolExecutor(max_workers=min(16, len(eval_files))) as ex:
+        return list(ex.map(read_eval_log, eval_files))
 
 # Because we're loading from file have to be very careful about attribute access, we have no idea what might be present or ciorrupted or whatever
 def _sample_is_correct(sample: object) -> bool:
@@ -95,15 +107,23 @@ def _sample_completion(sample: object) -> str:
 
     return "No Completion Provided"
 
+_NUM_RE = re.compile(r"(\d+)")
+
+# Filenames repeat across every model's samples, so tokenize each one only once
+@lru_cache(maxsize=None)
+def _filename_sort_key(filename: str) -> tuple:
+    # Split keeps digit runs at odd indices, so keys always alternate str/int and compare safely
+    parts = _NUM_RE.split(filename.lower())
+    return tuple(int(part) if i % 2 else part for i, part in enumerate(parts))
+
 # Build our actual results, safely
-def _collect_sample_results(log: EvalLog, images_dir: Path) -> tuple[ModelSummary, list[SampleResult]]:
+def _collect_sample_results(log: EvalLog) -> tuple[ModelSummary, list[SampleResult]]:
     model_name = str(getattr(log.eval, "model", "unknown"))
     samples = list(getattr(log, "samples", []))
 
     sample_results: list[SampleResult] = []
     for sample in samples:
         filename = _sample_filename(sample)
-        image_path = images_dir / filename
         completion = _sample_completion(sample)
         is_correct = _sample_is_correct(sample)
         targets_raw = list(getattr(sample, "target", []))
@@ -114,8 +134,10 @@ def _collect_sample_results(log: EvalLog, images_dir: Path) -> tuple[ModelSummar
                 filename=filename,
                 completion=completion,
                 correct=is_correct,
-                image_path=image_path,
                 targets=targets,
+                sort_key=_filename_sort_key(filename),
+                filename_html=_escape_html_text(filename),
+                filename_attr=_escape_html_attr(filename),
             )
         )
 
@@ -155,29 +177,31 @@ def _render_table(
 ) -> str:
     if column_widths and len(column_widths) != len(headers):
         raise ValueError("Column widths must match headers length.")
-    header_cells = "".join(f"<th>{_escape_html_text(str(header))}</th>" for header in headers)
-    colgroup = ""
+    # Write straight into one buffer rather than building per-row intermediate strings
+    buf = io.StringIO()
+    buf.write('<table width="100%">\n')
     if column_widths:
-        col_tags = "".join(f'    <col width="{_escape_html_attr(width)}">\n' for width in column_widths)
-        colgroup = "<colgroup>\n" + col_tags + "</colgroup>\n"
-    body_rows = []
+        buf.write("<colgroup>\n")
+        for width in column_widths:
+            buf.write('    <col width="')
+            buf.write(_escape_html_attr(width))
+            buf.write('">\n')
+        buf.write("</colgroup>\n")
+    buf.write("  <thead>\n    <tr>")
+    for header in headers:
+        buf.write("<th>")
+        buf.write(_escape_html_text(str(header)))
+        buf.write("</th>")
+    buf.write("</tr>\n  </thead>\n  <tbody>\n")
     for row in rows:
-        cells = "".join(f"<td>{cell}</td>" for cell in row)
-        body_rows.append(f"    <tr>{cells}</tr>")
-    body = "\n".join(body_rows)
-    if body:
-        body += "\n"
-    return (
-        f"<table width=\"100%\">\n"
-        f"{colgroup}"
-        "  <thead>\n"
-        f"    <tr>{header_cells}</tr>\n"
-        "  </thead>\n"
-        "  <tbody>\n"
-        f"{body}"
-        "  </tbody>\n"
-        "</table>"
-    )
+        buf.write("    <tr>")
+        for cell in row:
+            buf.write("<td>")
+            buf.write(cell)
+            buf.write("</td>")
+        buf.write("</tr>\n")
+    buf.write("  </tbody>\n</table>")
+    return buf.getvalue()
 
 
 def _slugify(name: str) -> str:
@@ -190,11 +214,16 @@ def _relpath(path: Path, start: Path) -> str:
     return os.path.relpath(path, start=start).replace(os.sep, "/")
 
 
+def _rel_prefix(images_dir: Path, start: Path) -> str:
+    # All images share one parent, so one relpath call covers every row
+    rel = _relpath(images_dir, start=start)
+    return "" if rel == "." else rel + "/"
+
+
 def _build_scoreboard_content(summaries: Sequence[ModelSummary]) -> str:
-    sorted_summaries = sorted(
-        summaries,
-        key=lambda summary: (-summary.accuracy, -summary.num_correct, summary.name),
-    )
+    # Stable sorts: name ascending breaks ties between equal (accuracy, num_correct), both descending
+    sorted_summaries = sorted(summaries, key=attrgetter("name"))
+    sorted_summaries.sort(key=attrgetter("accuracy", "num_correct"), reverse=True)
 
     rows = [
         (
@@ -211,14 +240,15 @@ def _build_scoreboard_content(summaries: Sequence[ModelSummary]) -> str:
 def _build_model_table_content(
     model_name: str,
     samples: Sequence[SampleResult],
+    images_dir: Path,
     output_dir: Path,
 ) -> str:
+    # Escaping is per-character, so the escaped prefix and filename can be joined directly
+    rel_prefix = _escape_html_attr(_rel_prefix(images_dir, start=output_dir))
     rows: list[tuple[str, str, str]] = []
     for sample in samples:
-        image_link = _relpath(sample.image_path, start=output_dir)
-        filename_cell = (
-            f'<a href="{_escape_html_attr(image_link)}">{_escape_html_text(sample.filename)}</a>'
-        )
+        image_link = rel_prefix + sample.filename_attr
+        filename_cell = f'<a href="{image_link}">{sample.filename_html}</a>'
         answer_cell = _escape_html_text(sample.completion)
         correctness_cell = "✅" if sample.correct else "❌"
         rows.append((filename_cell, answer_cell, correctness_cell))
@@ -231,11 +261,16 @@ def _build_model_table_content(
     return f"# {model_name}\n\n{table}\n"
 
 
-def _build_study_table_content(samples: Sequence[SampleResult], output_dir: Path) -> str:
+def _build_study_table_content(
+    samples: Sequence[SampleResult],
+    images_dir: Path,
+    output_dir: Path,
+) -> str:
+    rel_prefix = _escape_html_attr(_rel_prefix(images_dir, start=output_dir))
     rows: list[tuple[str, str]] = []
     for sample in samples:
-        image_src = _escape_html_attr(_relpath(sample.image_path, start=output_dir))
-        image_alt = _escape_html_attr(sample.filename)
+        image_src = rel_prefix + sample.filename_attr
+        image_alt = sample.filename_attr
         image_markdown = f'<img src="{image_src}" alt="{image_alt}" width="500">'
         targets_cell = _format_targets(sample.targets)
         rows.append((image_markdown, targets_cell))
@@ -250,6 +285,9 @@ def _build_study_table_content(samples: Sequence[SampleResult], output_dir: Path
 
 def _write_markdown(path: Path, content: str) -> None:
     path.write_text(content, encoding="utf-8")
+
+
+def _report_written(path: Path) -> None:
     try:
         relative = path.relative_to(Path.cwd())
     except ValueError:
@@ -272,7 +310,7 @@ def generate_table_files(
     study_samples: dict[str, SampleResult] = {}
 
     for log in eval_logs:
-        summary, samples = _collect_sample_results(log, images_dir)
+        summary, samples = _collect_sample_results(log)
         existing_summary = summaries.get(summary.name)
         if existing_summary:
             summaries[summary.name] = ModelSummary(
@@ -289,29 +327,30 @@ def generate_table_files(
 
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    outputs: list[tuple[Path, str]] = []
+
     if do_accuracy:
         scoreboard_path = output_dir / "model-accuracy.md"
-        _write_markdown(scoreboard_path, _build_scoreboard_content(list(summaries.values())))
+        outputs.append((scoreboard_path, _build_scoreboard_content(list(summaries.values()))))
 
     if do_models:
         for model_name, samples in model_samples.items():
             model_path = output_dir / f"{_slugify(model_name)}.md"
-            ordered_samples = sorted(samples, key=lambda sample: _filename_sort_key(sample.filename))
-            _write_markdown(model_path, _build_model_table_content(model_name, ordered_samples, output_dir))
+            ordered_samples = sorted(samples, key=attrgetter("sort_key"))
+            outputs.append((model_path, _build_model_table_content(model_name, ordered_samples, images_dir, output_dir)))
 
     if do_answers:
         study_path = output_dir / "answers.md"
         ordered_study_samples = sorted(study_samples.values(), key=lambda sample: sample.filename.lower())
-        _write_markdown(
-            study_path,
-            _build_study_table_content(ordered_study_samples, output_dir),
-        )
-def _filename_sort_key(filename: str) -> tuple:
-    parts = re.findall(r"\d+|\D+", filename.lower())
-    key: list[object] = []
-    for part in parts:
-        if part.isdigit():
-            key.append(int(part))
-        else:
-            key.append(part)
-    return tuple(key)
+        outputs.append((study_path, _build_study_table_content(ordered_study_samples, images_dir, output_dir)))
+
+    if not outputs:
+        return
+
+    # Output files are independent (one per model plus summaries), so write them concurrently
+    with ThreadPoolExecutor(max_workers=len(outputs)) as ex:
+        list(ex.map(lambda output: _write_markdown(*output), outputs))
+
+    # Report from the main thread once all writes finish, so console order is deterministic
+    for path, _ in outputs:
+        _report_written(path)